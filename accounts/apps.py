@@ -2,4 +2,10 @@ from django.apps import AppConfig
 
 class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'accounts'
\ No newline at end of file
+    name = 'accounts'
+
+    def ready(self):
+        # Connect the Transaction signals and start the background thread
+        # that rebuilds the analytics snapshot off the request path
+        from . import signals
+        signals.start_worker()
\ No newline at end of file
@@ -6,6 +6,15 @@ class Transaction(models.Model):
     expenditure = models.FloatField()
     date_added = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Keeps the per-category GROUP BY on the dashboard index-assisted
+            models.Index(fields=['category'], name='transaction_category_idx'),
+            # Serves both the date-ordered snapshot export and (scanned
+            # backwards) the order_by('-date_added')[:10] recent list
+            models.Index(fields=['date_added'], name='transaction_date_idx'),
+        ]
+
     def __str__(self):
         return f"{self.product_name} ({self.category}) - ₹{self.expenditure}"
 
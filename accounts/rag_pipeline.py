@@ -1,4 +1,6 @@
+import hashlib
 import os
+import threading
 import pandas as pd
 from dotenv import load_dotenv
 
@@ -28,27 +30,73 @@ def init_vector_db():
     if not os.path.exists(df_path):
         raise FileNotFoundError(f"Transaction file not found: {df_path}")
 
-    df = pd.read_csv(df_path)
-
-    # Convert each row into a readable text chunk
-    texts = [
-        f"Date: {r['Date']}, Category: {r['Category']}, Amount: ₹{r['Amount']}, Description: {r.get('Description', '')}"
-        for _, r in df.iterrows()
-    ]
+    # Arrow's multi-threaded CSV reader parses faster than the default C
+    # engine and hands back already-typed columns
+    df = pd.read_csv(df_path, engine='pyarrow')
+
+    # Convert each row into a readable text chunk — column-wise string
+    # concatenation instead of iterrows(), which materializes a Series per row
+    description = df['Description'].fillna('').astype(str) if 'Description' in df.columns else ''
+    texts = (
+        "Date: " + df['Date'].astype(str)
+        + ", Category: " + df['Category'].astype(str)
+        + ", Amount: ₹" + df['Amount'].astype(str)
+        + ", Description: " + description
+    ).tolist()
+
+    # Stable content-derived ids, so new transactions can be added to the
+    # store without re-embedding everything already in it. Identical rows
+    # (same date/category/amount/description) hash identically, so repeats
+    # get an occurrence ordinal — chromadb rejects duplicate ids within one
+    # upsert, and genuine duplicate transactions should each keep their own
+    # document anyway
+    ids = []
+    seen = {}
+    for t in texts:
+        digest = hashlib.blake2b(t.encode('utf-8'), digest_size=16).hexdigest()
+        n = seen.get(digest, 0)
+        seen[digest] = n + 1
+        ids.append(digest if n == 0 else f'{digest}-{n}')
 
     embedding = OllamaEmbeddings(model="nomic-embed-text")
     persist_directory = "chroma_db"
 
-    # Load or create the vector DB
-    if os.path.exists(persist_directory) and os.listdir(persist_directory):
-        db = Chroma(persist_directory=persist_directory, embedding_function=embedding)
-    else:
-        db = Chroma.from_texts(texts, embedding, persist_directory=persist_directory)
+    db = Chroma(persist_directory=persist_directory, embedding_function=embedding)
+
+    # Two-way sync with the source CSV: embed only rows the store hasn't
+    # seen, and drop ids that no longer correspond to any current row —
+    # deleted transactions, and any entries from a store built before
+    # content-derived ids existed (Chroma auto-UUIDs), which would otherwise
+    # duplicate every retrieval result forever
+    existing = set(db.get(include=[])['ids'])
+    stale = existing - set(ids)
+    if stale:
+        db._collection.delete(ids=list(stale))
+    new = [(i, t) for i, t in zip(ids, texts) if i not in existing]
+    if new:
+        _add_texts_batched(db, embedding, [t for _, t in new], [i for i, _ in new])
+    if stale or new:
         db.persist()
 
     return db
 
 
+# Embedding one row per HTTP request is the slow path — batch them
+_EMBED_BATCH_SIZE = 64
+
+
+def _add_texts_batched(db, embedding, texts, ids):
+    """Embed texts in fixed-size batches and hand the vectors to Chroma"""
+    for start in range(0, len(texts), _EMBED_BATCH_SIZE):
+        batch = texts[start:start + _EMBED_BATCH_SIZE]
+        vectors = embedding.embed_documents(batch)
+        db._collection.upsert(
+            ids=ids[start:start + _EMBED_BATCH_SIZE],
+            documents=batch,
+            embeddings=vectors,
+        )
+
+
 
 # Initializing Groq LLM
 
@@ -106,9 +154,23 @@ def create_rag_chain():
 
 
 
+# ✅ Build the chain once per process — re-creating it re-opens Chroma and
+# re-instantiates the Ollama embedder and Groq client on every question
+_RAG_CHAIN = None
+_RAG_CHAIN_LOCK = threading.Lock()
+
+
+def _get_rag_chain():
+    global _RAG_CHAIN
+    with _RAG_CHAIN_LOCK:
+        if _RAG_CHAIN is None:
+            _RAG_CHAIN = create_rag_chain()
+    return _RAG_CHAIN
+
+
 def handle_query(user_query):
     search = DuckDuckGoSearchRun()
-    retrieval_chain = create_rag_chain()
+    retrieval_chain = _get_rag_chain()
 
     # Add extra info if it's a travel-related question
     if any(word in user_query.lower() for word in ["trip", "travel", "hotel", "vacation"]):
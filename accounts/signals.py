@@ -0,0 +1,47 @@
+import logging
+from queue import Queue
+from threading import Thread
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Transaction
+
+logger = logging.getLogger(__name__)
+
+# Wake-ups for the background snapshot worker. The payload doesn't matter —
+# the DB is authoritative, so the worker always re-exports from it.
+_REFRESH_QUEUE = Queue()
+_WORKER = None
+
+
+def _snapshot_worker():
+    from . import views
+    while True:
+        _REFRESH_QUEUE.get()
+        # Coalesce bursts: drain whatever queued up while we were busy so a
+        # run of inserts triggers one export, not one per row
+        while not _REFRESH_QUEUE.empty():
+            _REFRESH_QUEUE.get_nowait()
+        try:
+            views._refresh_snapshot(views.SNAPSHOT_PATH)
+        except Exception:
+            # The worker must survive a bad refresh — it is retried by the
+            # next signal, or lazily by visualize() itself — but never fail
+            # silently
+            logger.exception('Background snapshot refresh failed')
+
+
+def start_worker():
+    global _WORKER
+    if _WORKER is None:
+        _WORKER = Thread(target=_snapshot_worker, daemon=True, name='snapshot-refresh')
+        _WORKER.start()
+
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+def _queue_snapshot_refresh(sender, **kwargs):
+    # Runs inside the request, but only pushes a token onto an in-process
+    # queue — the Parquet write itself happens off the request thread
+    _REFRESH_QUEUE.put(None)
@@ -1,13 +1,106 @@
 from django.shortcuts import render, redirect
 from .forms import TransactionForm
 from .models import Transaction
-from .data_analysis import analyze_transactions, get_spending_insights
+from .data_analysis import analyze_transactions, build_chart_specs, get_spending_insights
+import numpy as np
 import pandas as pd
 import os
-import csv
+import threading
 from django.contrib import messages
+from django.core.cache import cache
+from django.db.models import Count, Max, Sum
+from django.http import HttpResponseNotModified
+from django.utils.http import http_date, parse_http_date_safe
+
+SNAPSHOT_PATH = 'data/transactions.parquet'
+
+# Version stamp of the table the snapshot was last exported from; None forces
+# a rebuild on the next visualize. Count alone is not enough — a delete
+# followed by an add leaves the count unchanged — so the newest date_added
+# goes in too: auto_now_add means every insert raises it, and unlike the max
+# id it cannot be reused by SQLite after the newest row is deleted. It is
+# also the same stamp visualize() keys its context cache on.
+_snapshot_exported_version = None
+
+# The background signal worker and request threads can both trigger a
+# refresh; serialize them so only one export runs at a time
+_refresh_lock = threading.Lock()
+
+
+def _refresh_snapshot(path):
+    """
+    Keep the analytics snapshot in sync with the database, lazily.
+
+    The DB is authoritative: the snapshot is rebuilt in one sequential pass
+    whenever the table's version stamp no longer matches what was last
+    exported. It is written as Parquet so the analytics side reads typed
+    columns directly — no text parsing, no datetime inference.
+    """
+    global _snapshot_exported_version
+    with _refresh_lock:
+        version = Transaction.objects.aggregate(n=Count('id'), m=Max('date_added'))
+        version = (version['n'], version['m'])
+        if version == _snapshot_exported_version and os.path.isfile(path):
+            return
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Stream rows in server-side chunks so the export never holds the
+        # whole queryset in memory at once
+        rows = Transaction.objects.order_by('date_added').values_list(
+            'product_name', 'category', 'expenditure', 'date_added'
+        ).iterator(chunk_size=2000)
+        df = pd.DataFrame.from_records(
+            rows, columns=['product_name', 'category', 'expenditure', 'date_added']
+        )
+        df['category'] = df['category'].astype('category')
+        df['expenditure'] = df['expenditure'].astype('float32')
+        # Django hands back aware datetimes (USE_TZ); store them naive like
+        # the old text export did
+        df['date_added'] = pd.to_datetime(df['date_added']).dt.tz_localize(None)
+        # Write to a sibling temp file and rename it into place: readers in
+        # other threads always see either the old snapshot or the new one,
+        # never a half-written file
+        tmp_path = path + '.tmp'
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        _snapshot_exported_version = version
+
+
+# Materialized dashboard aggregates: one small cached dict instead of
+# re-reading and re-aggregating the whole transaction history per GET
+DASHBOARD_STATS_KEY = 'dashboard_stats'
+
+
+def _compute_dashboard_stats():
+    """Full recompute of the dashboard aggregates, pushed down to SQL"""
+    totals = Transaction.objects.aggregate(total=Sum('expenditure'), n=Count('id'))
+    by_category = dict(
+        Transaction.objects.values_list('category').annotate(s=Sum('expenditure'))
+    )
+    return {
+        'total_spent': totals['total'] or 0.0,
+        'count': totals['n'],
+        'by_category': by_category,
+    }
+
+
+def _get_dashboard_stats():
+    stats = cache.get(DASHBOARD_STATS_KEY)
+    if stats is None:
+        stats = _compute_dashboard_stats()
+        cache.set(DASHBOARD_STATS_KEY, stats, None)
+    return stats
+
+
+def _invalidate_dashboard_stats():
+    """
+    Drop the cached stats after any insert or delete. Patching deltas into
+    the cached dict is a read-modify-write race between concurrent requests
+    (a lost update drifts the totals forever), whereas the full recompute is
+    one cheap SQL aggregate on the next GET.
+    """
+    cache.delete(DASHBOARD_STATS_KEY)
 
-DATA_PATH = os.path.join(os.path.dirname(__file__), '../data/transactions.csv')
 
 def home(request):
     form = TransactionForm()
@@ -16,53 +109,20 @@ def home(request):
     if request.method == 'POST':
         form = TransactionForm(request.POST)
         if form.is_valid():
-            transaction = form.save() 
-
-            # Save to CSV as well
-            csv_path = 'data/transactions.csv'
-            
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(csv_path), exist_ok=True)
-            
-            file_exists = os.path.isfile(csv_path)
-
-            try:
-                with open(csv_path, 'a', newline='', encoding='utf-8') as file:
-                    writer = csv.writer(file)
-                    if not file_exists:
-                        # Write headers only once
-                        writer.writerow(['product_name', 'category', 'expenditure', 'date_added'])
-                    writer.writerow([
-                        transaction.product_name,
-                        transaction.category,
-                        transaction.expenditure,
-                        transaction.date_added.strftime('%Y-%m-%d %H:%M:%S')  
-                    ])
-                
-                messages.success(request, 'Transaction added successfully!')
-                
-            except Exception as e:
-                messages.error(request, f'Error saving transaction: {str(e)}')
-                
+            form.save()
+            _invalidate_dashboard_stats()
+            messages.success(request, 'Transaction added successfully!')
             return redirect('home')
 
-    # Calculate quick stats for dashboard
-    total_transactions = Transaction.objects.count()
-    try:
-        if os.path.isfile('data/transactions.csv'):
-            df = pd.read_csv('data/transactions.csv')
-            if not df.empty:
-                total_spent = df['expenditure'].sum()
-                avg_spent = df['expenditure'].mean()
-                top_category = df.groupby('category')['expenditure'].sum().idxmax()
-            else:
-                total_spent = avg_spent = 0
-                top_category = 'N/A'
-        else:
-            total_spent = avg_spent = 0
-            top_category = 'N/A'
-    except Exception as e:
-        print(f"Error calculating stats: {e}")
+    # Quick stats for dashboard, straight from the materialized summary —
+    # the cached count spares a SELECT COUNT(*) per GET
+    stats = _get_dashboard_stats()
+    total_transactions = stats['count']
+    if stats['count']:
+        total_spent = stats['total_spent']
+        avg_spent = total_spent / stats['count']
+        top_category = max(stats['by_category'], key=stats['by_category'].get)
+    else:
         total_spent = avg_spent = 0
         top_category = 'N/A'
 
@@ -81,10 +141,11 @@ def visualize(request):
     """
     Enhanced visualization view with comprehensive analytics
     """
-    csv_path = 'data/transactions.csv'
-    
-    # Check if CSV file exists
-    if not os.path.isfile(csv_path):
+    path = SNAPSHOT_PATH
+
+    # O(1) existence probe before any file or pandas work: with an empty
+    # table the whole analytics stack can be skipped outright
+    if not Transaction.objects.exists():
         context = {
             'summary': 'No transaction data available yet. Please add transactions first.',
             'charts': [],
@@ -92,47 +153,117 @@ def visualize(request):
             'has_data': False
         }
         return render(request, 'finance/visualize.html', context)
-    
+
+    # Read the version stamp for the context cache *before* refreshing the
+    # snapshot: a transaction landing in between then changes the stamp seen
+    # by the next request instead of being baked into a key whose context
+    # was built from the pre-insert snapshot
+    version = Transaction.objects.aggregate(m=Max('date_added'), n=Count('id'))
+
+    # The signal worker keeps the snapshot fresh in the background; this is
+    # just a safety net for anything written before the worker existed, and
+    # it guarantees the file exists past this point
+    _refresh_snapshot(path)
+
+    # The whole page is derived from the snapshot, so its mtime is an honest
+    # Last-Modified: answer conditional GETs with an empty 304 instead of
+    # re-sending ~15 base64 PNGs
+    mtime = int(os.path.getmtime(path))
+    if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+    if if_modified_since is not None and if_modified_since >= mtime:
+        return HttpResponseNotModified()
+
+    # Cache the fully-built context keyed on a DB version stamp — the key
+    # changes whenever a transaction is added or removed, so stale entries
+    # simply stop being read and need no explicit invalidation
+    want_png = request.GET.get('charts') == 'png'
+    cache_key = f"viz:{version['m']}:{version['n']}:{'png' if want_png else 'specs'}"
+    context = cache.get(cache_key)
+    if context is None:
+        context = _build_visualize_context(path, want_png)
+        # Never cache a failed build — a transient error would otherwise be
+        # pinned to this version key and served until it expires
+        if context.get('has_data') and 'error_message' not in context:
+            cache.set(cache_key, context, 3600)
+
+    response = render(request, 'finance/visualize.html', context)
+    response['Last-Modified'] = http_date(mtime)
+    return response
+
+
+def _build_visualize_context(path, want_png):
+    """
+    Build the full template context for the visualize page (cache-miss path)
+    """
     try:
-        # Get comprehensive analysis
-        summary, charts = analyze_transactions(csv_path)
-        
+        # Default path ships small JSON chart specs and lets the browser
+        # render them with Plotly; ?charts=png keeps the legacy
+        # server-rendered matplotlib PNGs available
+        if want_png:
+            summary, charts = analyze_transactions(path)
+            chart_specs = []
+        else:
+            summary, chart_specs = build_chart_specs(path)
+            charts = []
+
         # Get text-based insights
-        insights = get_spending_insights(csv_path)
-        
-        # Read data for additional context
-        df = pd.read_csv(csv_path)
+        insights = get_spending_insights(path)
+
+        # Read data for additional context — only the listed columns, already
+        # typed by the Parquet writer
+        df = pd.read_parquet(
+            path,
+            columns=['product_name', 'category', 'expenditure', 'date_added'],
+        )
         
-        # Calculate additional statistics for template
+        # Calculate additional statistics for template. The snapshot columns
+        # come back already typed (real timestamps, float32 amounts), so no
+        # re-parsing or coercion pass is needed here.
         if not df.empty:
-            df['date_added'] = pd.to_datetime(df['date_added'], errors='coerce')
-            df.dropna(subset=['date_added', 'expenditure'], inplace=True)
-            
-            total_spent = df['expenditure'].sum()
-            avg_spent = df['expenditure'].mean()
-            median_spent = df['expenditure'].median()
-            max_spent = df['expenditure'].max()
-            min_spent = df['expenditure'].min()
-            std_spent = df['expenditure'].std()
-            transaction_count = len(df)
-            
-            # Category breakdown
-            category_totals = df.groupby('category')['expenditure'].sum().to_dict()
-            category_counts = df['category'].value_counts().to_dict()
+            # One agg pass over the expenditure buffer instead of seven
+            # independent full-column scans
+            stats = df['expenditure'].agg(['sum', 'mean', 'median', 'max', 'min', 'std', 'count'])
+            total_spent = stats['sum']
+            avg_spent = stats['mean']
+            median_spent = stats['median']
+            max_spent = stats['max']
+            min_spent = stats['min']
+            std_spent = stats['std']
+            transaction_count = int(stats['count'])
             
+            # Category breakdown — one hash-group pass yields both the sums
+            # and the counts; everything else reads off the result
+            cat_agg = df.groupby('category', sort=False, observed=True)['expenditure'].agg(
+                ['sum', 'count'])
+            category_totals = cat_agg['sum'].to_dict()
+            category_counts = cat_agg['count'].sort_values(ascending=False).to_dict()
+
             # Top category
-            top_category = df.groupby('category')['expenditure'].sum().idxmax()
-            top_category_amount = df.groupby('category')['expenditure'].sum().max()
+            top_category = cat_agg['sum'].idxmax()
+            top_category_amount = cat_agg['sum'].max()
             
-            # Most frequent category
-            most_frequent_category = df['category'].mode()[0] if len(df) > 0 else 'N/A'
+            # Most frequent category — argmax over the counts we already
+            # have, no separate mode() scan
+            most_frequent_category = cat_agg['count'].idxmax()
             
-            # Top 5 transactions
-            top_transactions = df.nlargest(5, 'expenditure')[['product_name', 'expenditure', 'category', 'date_added']].to_dict('records')
+            # Top 5 transactions — O(n) partition for the top five instead of
+            # a full sort, then order just those rows
+            expd = df['expenditure'].to_numpy()
+            if len(expd) > 5:
+                idx = np.argpartition(expd, -5)[-5:]
+            else:
+                idx = np.arange(len(expd))
+            idx = idx[np.argsort(-expd[idx])]
+            top_transactions = df.iloc[idx][['product_name', 'expenditure', 'category', 'date_added']].to_dict('records')
             
-            # Monthly trend
-            df['month'] = df['date_added'].dt.to_period('M').astype(str)
-            monthly_totals = df.groupby('month')['expenditure'].sum().to_dict()
+            # Monthly trend — a plain datetime64[M] cast truncates every row
+            # to its month in one vectorized pass, no per-row Period objects
+            months = df['date_added'].values.astype('datetime64[M]')
+            month_sum = df['expenditure'].groupby(months).sum().sort_index()
+            monthly_totals = dict(zip(
+                np.datetime_as_string(month_sum.index.values.astype('datetime64[M]'), unit='M'),
+                month_sum.to_numpy(),
+            ))
             
             has_data = True
         else:
@@ -151,6 +282,7 @@ def visualize(request):
         context = {
             'summary': summary,
             'charts': charts,
+            'chart_specs': chart_specs,
             'insights': insights,
             'has_data': has_data,
             
@@ -199,29 +331,25 @@ def visualize(request):
             'has_data': False,
             'error_message': str(e)
         }
-    
-    return render(request, 'finance/visualize.html', context)
+
+    return context
 
 
 def delete_transaction(request, transaction_id):
     """
-    Delete a transaction from both database and CSV
+    Delete a transaction from the database
     """
     if request.method == 'POST':
         try:
             # Delete from database
             transaction = Transaction.objects.get(id=transaction_id)
             transaction.delete()
-            
-            # Update CSV file - remove the deleted transaction
-            csv_path = 'data/transactions.csv'
-            if os.path.isfile(csv_path):
-                df = pd.read_csv(csv_path)
-                # Note: This is a simple approach, you might need to match by multiple fields
-                # depending on your data structure
-                df = df[df['product_name'] != transaction.product_name]
-                df.to_csv(csv_path, index=False)
-            
+            _invalidate_dashboard_stats()
+
+            # The DB is authoritative — the analytics snapshot is rebuilt
+            # lazily by _refresh_snapshot() once the version stamp changes,
+            # so no O(N) read-filter-rewrite of the file here
+
             messages.success(request, 'Transaction deleted successfully!')
             
         except Transaction.DoesNotExist:
@@ -232,28 +360,35 @@ def delete_transaction(request, transaction_id):
     return redirect('home')
 
 
+class _Echo:
+    """Pseudo file whose write() just returns the value (Django docs trick)"""
+    def write(self, value):
+        return value
+
+
 def export_data(request):
     """
-    Export transactions as CSV download
+    Export transactions as a streaming CSV download
     """
-    from django.http import HttpResponse
+    from django.http import StreamingHttpResponse
     import csv
-    
-    response = HttpResponse(content_type='text/csv')
+
+    # Stream the rows instead of materializing the whole report in memory:
+    # first bytes reach the client immediately and exports can exceed RAM
+    writer = csv.writer(_Echo())
+
+    def rows():
+        yield writer.writerow(['Product Name', 'Category', 'Expenditure', 'Date Added'])
+        for transaction in Transaction.objects.order_by('-date_added').iterator(chunk_size=2000):
+            yield writer.writerow([
+                transaction.product_name,
+                transaction.category,
+                transaction.expenditure,
+                transaction.date_added.strftime('%Y-%m-%d %H:%M:%S')
+            ])
+
+    response = StreamingHttpResponse(rows(), content_type='text/csv')
     response['Content-Disposition'] = 'attachment; filename="financial_report.csv"'
-    
-    writer = csv.writer(response)
-    writer.writerow(['Product Name', 'Category', 'Expenditure', 'Date Added'])
-    
-    transactions = Transaction.objects.all().order_by('-date_added')
-    for transaction in transactions:
-        writer.writerow([
-            transaction.product_name,
-            transaction.category,
-            transaction.expenditure,
-            transaction.date_added.strftime('%Y-%m-%d %H:%M:%S')
-        ])
-    
     return response
 
 
@@ -265,14 +400,11 @@ def clear_all_data(request):
         try:
             # Delete from database
             Transaction.objects.all().delete()
-            
-            # Clear CSV file
-            csv_path = 'data/transactions.csv'
-            if os.path.isfile(csv_path):
-                with open(csv_path, 'w', newline='', encoding='utf-8') as file:
-                    writer = csv.writer(file)
-                    writer.writerow(['product_name', 'category', 'expenditure', 'date_added'])
-            
+            _invalidate_dashboard_stats()
+
+            # The analytics snapshot is re-exported (empty) from the now
+            # empty table on the next visualize
+
             messages.success(request, 'All transactions cleared successfully!')
             
         except Exception as e: